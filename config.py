@@ -1,21 +1,12 @@
 # config.py
+import functools
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
-
-# Streamlit Cloud uses secrets.toml, not .env
-def get_secret(key, default=None):
-    """Get secret from Streamlit secrets or environment variables"""
-    try:
-        # First try Streamlit secrets
-        if hasattr(st, 'secrets') and key in st.secrets:
-            return st.secrets[key]
-    except:
-        pass
-    
-    # Fallback to environment variables
-    return os.getenv(key, default)
+# Parse .env only once even if this module is imported under several names
+if not os.environ.get('_DOTENV_LOADED'):
+    load_dotenv()
+    os.environ['_DOTENV_LOADED'] = '1'
 
 # Import streamlit for secrets (only in deployed environment)
 try:
@@ -24,7 +15,8 @@ try:
 except:
     USING_STREAMLIT = False
 
-# Configuration with fallbacks
+# Configuration with fallbacks, memoized so repeat lookups skip st.secrets probes
+@functools.lru_cache(maxsize=None)
 def get_config_value(key, default=None):
     if USING_STREAMLIT and hasattr(st, 'secrets') and key in st.secrets:
         return st.secrets[key]
@@ -46,14 +38,22 @@ NEO4J_PASSWORD = get_config_value("NEO4J_PASSWORD", "")
 
 # Embedding Configuration
 EMBEDDING_MODEL = "sentence-transformers/all-mpnet-base-v2"
+# "onnx" runs the encoder through ONNX Runtime (needs optimum/onnxruntime
+# installed) for roughly 2x CPU throughput; "torch" is the stock backend
+EMBEDDING_BACKEND = get_config_value("EMBEDDING_BACKEND", "torch")
 EMBEDDING_DIM = 768
-PINECONE_TARGET_DIM = 1024
+# Dimension of the Pinecone index. The current index is 1024, which forces
+# zero-padding of the 768-dim model output; rebuilding the index at 768 and
+# setting PINECONE_TARGET_DIM=768 drops the padding (and the dead dims it
+# uploads and scores) everywhere.
+PINECONE_TARGET_DIM = int(get_config_value("PINECONE_TARGET_DIM", "1024"))
 
 # Chat Configuration
 MAX_COMPLETION_TOKENS = 1024
 TEMPERATURE = 0.7
 
 # Check if we have minimum required APIs
+@functools.lru_cache(maxsize=1)
 def has_required_apis():
     return bool(PINECONE_API_KEY and GROQ_API_KEY)
 
@@ -2,29 +2,48 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import argparse
+import functools
+import time
+
 from pinecone import Pinecone
 from config import PINECONE_API_KEY, PINECONE_INDEX_NAME
 
-def debug_pinecone():
+@functools.lru_cache(maxsize=1)
+def get_client():
+    """One Pinecone client per process"""
+    return Pinecone(api_key=PINECONE_API_KEY)
+
+@functools.lru_cache(maxsize=1)
+def cached_list_indexes():
+    """Cache the control-plane index listing - it does not change mid-session"""
+    return get_client().list_indexes()
+
+@functools.lru_cache(maxsize=4)
+def cached_index_stats(index_name):
+    """Cache index stats so repeated debug runs skip the HTTPS round trip"""
+    return get_client().Index(index_name).describe_index_stats()
+
+def debug_pinecone(probe_writes: bool = False):
     """Debug Pinecone connection and index status"""
     print("🔧 Pinecone Debug Information")
     print("=" * 50)
     
     try:
         # Initialize Pinecone
-        pc = Pinecone(api_key=PINECONE_API_KEY)
+        pc = get_client()
         print(f"✅ Pinecone client initialized")
-        
-        # List all indexes
-        indexes = pc.list_indexes()
+
+        # List all indexes (cached per session)
+        indexes = cached_list_indexes()
         print(f"📋 Available indexes: {[idx.name for idx in indexes.indexes]}")
-        
+
         # Connect to specific index
         index = pc.Index(PINECONE_INDEX_NAME)
         print(f"✅ Connected to index: {PINECONE_INDEX_NAME}")
-        
-        # Get detailed stats
-        stats = index.describe_index_stats()
+
+        # Get detailed stats (cached per session)
+        stats = cached_index_stats(PINECONE_INDEX_NAME)
         print(f"📊 Index Statistics:")
         print(f"   - Total Vectors: {stats.get('total_vector_count', 0)}")
         print(f"   - Dimension: {stats.get('dimension', 0)}")
@@ -38,9 +57,14 @@ def debug_pinecone():
         else:
             print("   - No namespaces found (using default)")
             
-        # Test vector operations
+        # Test vector operations only when explicitly requested - the default
+        # diagnostic run stays read-only and skips six write round-trips
+        if not probe_writes:
+            print("\nℹ️  Skipping write probes (pass --probe-writes to test upserts)")
+            return
+
         print("\n🧪 Testing vector operations...")
-        
+
         # Try to upsert a test vector
         test_vector = {
             "id": "test_vector_123",
@@ -64,11 +88,17 @@ def debug_pinecone():
                     index.upsert(vectors=[test_vector], namespace=ns)
                 
                 print(f"   ✅ Successfully upserted test vector to namespace: {ns}")
-                
-                # Check if vector exists
-                time.sleep(1)  # Wait for upsert to propagate
-                fetch_result = index.fetch(ids=["test_vector_123"], namespace=ns if ns != "" else None)
-                if fetch_result and 'test_vector_123' in fetch_result.vectors:
+
+                # Poll for propagation instead of a fixed one-second sleep
+                found = False
+                for _ in range(10):
+                    fetch_result = index.fetch(ids=["test_vector_123"], namespace=ns if ns != "" else None)
+                    if fetch_result and 'test_vector_123' in fetch_result.vectors:
+                        found = True
+                        break
+                    time.sleep(0.1)
+
+                if found:
                     print(f"   ✅ Vector found in namespace: {ns}")
                 else:
                     print(f"   ❌ Vector not found in namespace: {ns}")
@@ -85,4 +115,8 @@ def debug_pinecone():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    debug_pinecone()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Debug Pinecone connection and index status")
+    parser.add_argument("--probe-writes", action="store_true",
+                        help="also upsert/fetch/delete a test vector per namespace")
+    args = parser.parse_args()
+    debug_pinecone(probe_writes=args.probe_writes)
\ No newline at end of file
@@ -4,12 +4,15 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pinecone import Pinecone
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, AsyncGraphDatabase, READ_ACCESS
 import asyncio
 from typing import List, Dict, Any, Tuple
-import hashlib
+import collections
+import functools
+import logging
 import time
 import re
+import string
 from tqdm import tqdm
 
 from config import (
@@ -21,7 +24,142 @@ from config import (
     NEO4J_USERNAME, 
     NEO4J_PASSWORD
 )
-from utils.embeddings import get_embeddings, get_chat_completion
+from utils.embeddings import (
+    get_embeddings,
+    get_chat_completion,
+    get_chat_completion_async,
+    get_chat_completion_stream_async,
+)
+
+logger = logging.getLogger(__name__)
+
+# Module-level constant so the server sees the exact same query text every call
+# and can serve it from its plan cache. Matches the lowercase *_lc shadow
+# properties written at load time so the TEXT indexes can serve CONTAINS
+# (toLower() on the property side would force a full label scan).
+NEO4J_SEARCH_CYPHER = """
+MATCH (loc:Location)
+WHERE any(term IN $terms WHERE
+       loc.name_lc CONTAINS term OR
+       loc.type_lc CONTAINS term OR
+       loc.region_lc CONTAINS term OR
+       loc.description_lc CONTAINS term)
+
+// Only get locations that have proper data
+AND loc.name IS NOT NULL
+AND loc.name <> 'Unknown'
+AND loc.description IS NOT NULL
+AND size(loc.description) > 20
+
+OPTIONAL MATCH (loc)-[:LOCATED_IN]->(region:Region)
+OPTIONAL MATCH (loc)-[:HAS_TAG]->(tag:Tag)
+OPTIONAL MATCH (loc)-[:NEARBY]->(nearby:Location)
+
+WITH loc, region,
+     collect(DISTINCT tag.name) as tags,
+     collect(DISTINCT nearby.name) as nearby_locations
+
+RETURN
+    loc.id as node_id,
+    loc.name as name,
+    loc.type as type,
+    loc.region as region,
+    loc.description as description,
+    loc.best_time_to_visit as best_time,
+    tags,
+    region.name as region_name,
+    nearby_locations
+ORDER BY loc.name
+LIMIT 10
+"""
+
+# Keyword tables and regexes for extract_key_terms, built once at import.
+# Frozensets give O(1) membership against the tokenized query; multi-word
+# location names still need a substring check and live in their own tuple.
+_DAY_RE = re.compile(r'(\d+)\s*day')
+_WS_RE = re.compile(r'\s+')
+
+# Translate punctuation to spaces so tokenization is a plain split
+_PUNCT = str.maketrans({c: ' ' for c in string.punctuation})
+
+# Max entries in the per-instance whole-query result cache
+RESULT_CACHE_MAX = 256
+
+# The only metadata fields downstream consumers (build_prompt, the app's
+# result cards) actually read - everything else is dropped at the query edge
+_MATCH_METADATA_FIELDS = (
+    'name', 'type', 'region', 'description', 'semantic_text',
+    'tags', 'best_time_to_visit'
+)
+
+def _slim_match(match: Dict) -> Dict:
+    """Keep only the fields we use so the full raw match can be GC'd"""
+    metadata = match.get('metadata') or {}
+    return {
+        'id': match.get('id', ''),
+        'score': match.get('score', 0),
+        'metadata': {k: metadata[k] for k in _MATCH_METADATA_FIELDS if k in metadata},
+    }
+
+_VN_LOCATIONS = frozenset({
+    'hanoi', 'halong', 'hue', 'saigon', 'mekong', 'sapa',
+    'northern', 'central', 'southern'
+})
+
+_VN_MULTIWORD_LOCATIONS = (
+    'ha long', 'hoi an', 'da nang', 'nha trang', 'ho chi minh',
+    'ninh binh', 'phu quoc', 'da lat'
+)
+
+_TRAVEL_TERMS = frozenset({
+    'romantic', 'adventure', 'budget', 'luxury', 'family', 'solo', 'couple',
+    'beach', 'mountain', 'culture', 'food', 'historical', 'itinerary', 'tour',
+    'relax', 'explore', 'hiking', 'cruise', 'island', 'city', 'countryside'
+})
+
+# Optional: match every keyword (including multi-word names) in one linear
+# pass over the query instead of a scan per keyword. Falls back to the
+# tokenized set intersection below when pyahocorasick is not installed.
+try:
+    import ahocorasick
+
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _word in _TRAVEL_TERMS | _VN_LOCATIONS | set(_VN_MULTIWORD_LOCATIONS):
+        _KEYWORD_AUTOMATON.add_word(_word, _word)
+    _KEYWORD_AUTOMATON.make_automaton()
+except ImportError:
+    _KEYWORD_AUTOMATON = None
+
+@functools.lru_cache(maxsize=2048)
+def _embed_one(text: str) -> tuple:
+    """Embed a single text, memoized with bounded LRU eviction"""
+    return tuple(get_embeddings([text])[0])
+
+@functools.lru_cache(maxsize=512)
+def _extract_terms(query_lower: str) -> tuple:
+    """Extract key terms from a lowercased query, memoized per query text"""
+    if _KEYWORD_AUTOMATON is not None:
+        # Single linear pass; the boundary check keeps matches whole-word,
+        # so 'hue' no longer fires inside 'huge'
+        hits = set()
+        for end, word in _KEYWORD_AUTOMATON.iter(query_lower):
+            start = end - len(word) + 1
+            if ((start == 0 or not query_lower[start - 1].isalnum()) and
+                    (end + 1 == len(query_lower) or not query_lower[end + 1].isalnum())):
+                hits.add(word)
+        extracted = list(hits)
+    else:
+        # Tokenize once (punctuation becomes spaces), then intersect against
+        # the precompiled keyword sets for whole-word matches
+        tokens = set(query_lower.translate(_PUNCT).split())
+
+        extracted = list((_TRAVEL_TERMS & tokens) | (_VN_LOCATIONS & tokens))
+        extracted.extend(loc for loc in _VN_MULTIWORD_LOCATIONS if loc in query_lower)
+
+    # Extract number of days
+    extracted.extend(_DAY_RE.findall(query_lower))
+
+    return tuple(extracted) if extracted else ('vietnam', 'travel')
 
 class HybridChatSystem:
     def __init__(self):
@@ -29,8 +167,11 @@ class HybridChatSystem:
         self.pinecone_client = Pinecone(api_key=PINECONE_API_KEY)
         self.pinecone_index = self.pinecone_client.Index(PINECONE_INDEX_NAME)
         
-        # Initialize Neo4j client
+        # Initialize Neo4j clients - sync driver for lifecycle/status checks,
+        # async driver for the query hot path (same split as the Groq clients
+        # in EmbeddingManager)
         self.neo4j_driver = None
+        self.neo4j_async_driver = None
         try:
             self.neo4j_driver = GraphDatabase.driver(
                 NEO4J_URI, 
@@ -38,14 +179,36 @@ class HybridChatSystem:
             )
             self.neo4j_driver.verify_connectivity()
             print("✅ Connected to Neo4j")
+            # Warm the server's plan cache so the first real query skips planning
+            try:
+                with self.neo4j_driver.session() as session:
+                    session.run("EXPLAIN " + NEO4J_SEARCH_CYPHER, terms=[]).consume()
+            except Exception:
+                pass
+            self.neo4j_async_driver = AsyncGraphDatabase.driver(
+                NEO4J_URI,
+                auth=(NEO4J_USERNAME, NEO4J_PASSWORD)
+            )
         except Exception as e:
             print(f"⚠️  Neo4j not available: {e}")
             print("💡 Continuing with Pinecone-only search")
             self.neo4j_driver = None
+            self.neo4j_async_driver = None
         
-        # Cache for embeddings and results
-        self.embedding_cache = {}
-        
+        # LRU of (pinecone_results, neo4j_results) keyed by normalized query -
+        # repeat questions skip both network legs entirely
+        self._result_cache = collections.OrderedDict()
+
+        # LRUs of formatted prompt blocks keyed by result identity, so
+        # follow-up turns over the same retrieval set skip the formatting
+        self._vec_block_cache = collections.OrderedDict()
+        self._graph_block_cache = collections.OrderedDict()
+
+        # Throttle the Bolt handshake in get_system_status to once per TTL
+        self._last_verified = 0.0
+        self._verify_interval = 30.0
+        self._neo4j_alive = self.neo4j_driver is not None
+
         # System prompt optimized for your dataset
         self.system_prompt = """You are VietnamTravel AI, an expert travel assistant specializing in Vietnam tourism. 
 
@@ -64,140 +227,109 @@ Always base recommendations on the provided context data from the travel databas
 
     def get_cached_embedding(self, text: str) -> List[float]:
         """Get cached embedding or compute new one using local model"""
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        if text_hash in self.embedding_cache:
-            return self.embedding_cache[text_hash]
-        
-        embedding = get_embeddings([text])[0]
-        self.embedding_cache[text_hash] = embedding
-        return embedding
+        return list(_embed_one(text))
 
-    async def query_pinecone_async(self, query: str, top_k: int = 5) -> List[Dict]:
+    async def query_pinecone_async(self, query: str, top_k: int = 5, precomputed_embedding: List[float] = None) -> List[Dict]:
         """Query Pinecone asynchronously using local embeddings"""
-        query_embedding = self.get_cached_embedding(query)
-        
         try:
-            results = self.pinecone_index.query(
+            # Embedding and the Pinecone SDK call both block, so hop to a
+            # worker thread and keep the event loop free for the Neo4j leg
+            query_embedding = (
+                precomputed_embedding
+                if precomputed_embedding is not None
+                else await asyncio.to_thread(self.get_cached_embedding, query)
+            )
+            results = await asyncio.to_thread(
+                self.pinecone_index.query,
                 vector=query_embedding,
                 top_k=top_k,
                 include_metadata=True
             )
-            print(f"DEBUG: Pinecone found {len(results.get('matches', []))} results")
-            return results.get('matches', [])
+            matches = results.get('matches', [])
+            logger.debug("Pinecone found %d results", len(matches))
+            return [_slim_match(match) for match in matches]
         except Exception as e:
             print(f"❌ Error querying Pinecone: {e}")
             return []
 
     async def query_neo4j_async(self, query: str) -> List[Dict]:
         """Query Neo4j for contextual relationships - COMPLETELY FIXED VERSION"""
-        if not self.neo4j_driver:
+        if not self.neo4j_async_driver:
             return []
         
         key_terms = self.extract_key_terms(query)
-        
-        # COMPLETELY FIXED Neo4j query - only returns meaningful location data
-        neo4j_query = """
-        MATCH (loc:Location)
-        WHERE any(term IN $terms WHERE 
-               toLower(loc.name) CONTAINS toLower(term) OR
-               toLower(loc.type) CONTAINS toLower(term) OR
-               toLower(loc.region) CONTAINS toLower(term) OR
-               toLower(loc.description) CONTAINS toLower(term))
-        
-        // Only get locations that have proper data
-        AND loc.name IS NOT NULL 
-        AND loc.name <> 'Unknown'
-        AND loc.description IS NOT NULL
-        AND size(loc.description) > 20
-        
-        OPTIONAL MATCH (loc)-[:LOCATED_IN]->(region:Region)
-        OPTIONAL MATCH (loc)-[:HAS_TAG]->(tag:Tag)
-        OPTIONAL MATCH (loc)-[:NEARBY]->(nearby:Location)
-        
-        WITH loc, region, 
-             collect(DISTINCT tag.name) as tags, 
-             collect(DISTINCT nearby.name) as nearby_locations
-        
-        RETURN 
-            loc.id as node_id,
-            loc.name as name,
-            loc.type as type,
-            loc.region as region,
-            loc.description as description,
-            loc.best_time_to_visit as best_time,
-            tags,
-            region.name as region_name,
-            nearby_locations
-        ORDER BY loc.name
-        LIMIT 10
-        """
-        
+
+        async def _read(tx):
+            result = await tx.run(NEO4J_SEARCH_CYPHER, terms=key_terms)
+            return await result.data()
+
         try:
-            with self.neo4j_driver.session() as session:
-                result = session.run(neo4j_query, terms=key_terms)
-                records = []
-                for record in result:
-                    record_data = {
-                        "node_id": record.get("node_id", ""),
-                        "name": record.get("name", ""),
-                        "type": record.get("type", ""),
-                        "region": record.get("region_name") or record.get("region", ""),
-                        "description": record.get("description", ""),
-                        "best_time": record.get("best_time", ""),
-                        "tags": record.get("tags", []),
-                        "nearby_locations": record.get("nearby_locations", [])
-                    }
-                    records.append(record_data)
-                
-                print(f"DEBUG: Neo4j found {len(records)} meaningful locations")
-                return records
+            # Read-routed session on the native async driver - no thread hop,
+            # and clusters can serve the query from a replica
+            async with self.neo4j_async_driver.session(default_access_mode=READ_ACCESS) as session:
+                rows = await session.execute_read(_read)
+
+            records = []
+            for row in rows:
+                records.append({
+                    "node_id": row.get("node_id") or "",
+                    "name": row.get("name") or "",
+                    "type": row.get("type") or "",
+                    "region": row.get("region_name") or row.get("region") or "",
+                    "description": row.get("description") or "",
+                    "best_time": row.get("best_time") or "",
+                    "tags": row.get("tags") or [],
+                    "nearby_locations": row.get("nearby_locations") or []
+                })
+
+            logger.debug("Neo4j found %d meaningful locations", len(records))
+            return records
         except Exception as e:
             print(f"❌ Error querying Neo4j: {e}")
             return []
 
     def extract_key_terms(self, query: str) -> List[str]:
         """Enhanced key term extraction for Vietnam travel"""
-        query_lower = query.lower()
-        
-        # Vietnam locations from your dataset
-        vietnam_locations = [
-            'hanoi', 'ha long', 'halong', 'hue', 'hoi an', 'da nang', 'nha trang',
-            'saigon', 'ho chi minh', 'mekong', 'sapa', 'ninh binh', 'phu quoc',
-            'northern', 'central', 'southern', 'da lat'
-        ]
-        
-        # Travel-related terms
-        travel_terms = [
-            'romantic', 'adventure', 'budget', 'luxury', 'family', 'solo', 'couple',
-            'beach', 'mountain', 'culture', 'food', 'historical', 'itinerary', 'tour',
-            'relax', 'explore', 'hiking', 'cruise', 'island', 'city', 'countryside'
-        ]
-        
-        extracted = []
-        extracted.extend([term for term in travel_terms if term in query_lower])
-        extracted.extend([loc for loc in vietnam_locations if loc in query_lower])
-        
-        # Extract number of days
-        day_matches = re.findall(r'(\d+)\s*day', query_lower)
-        extracted.extend(day_matches)
-        
-        return extracted if extracted else ['vietnam', 'travel']
+        return list(_extract_terms(query.lower()))
 
-    async def hybrid_search(self, query: str) -> Tuple[List[Dict], List[Dict]]:
+    async def hybrid_search(self, query: str, precomputed_embedding: List[float] = None) -> Tuple[List[Dict], List[Dict]]:
         """Perform hybrid search using both Pinecone and Neo4j"""
-        # Run both queries concurrently
-        pinecone_task = self.query_pinecone_async(query)
-        neo4j_task = self.query_neo4j_async(query) if self.neo4j_driver else asyncio.sleep(0)
-        
-        pinecone_results = await pinecone_task
-        neo4j_results = await neo4j_task if self.neo4j_driver else []
-        
+        cache_key = _WS_RE.sub(' ', query.lower().strip())
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+            return cached
+
+        # Both legs run in worker threads, so gather overlaps them for real
+        pinecone_results, neo4j_results = await asyncio.gather(
+            self.query_pinecone_async(query, precomputed_embedding=precomputed_embedding),
+            self.query_neo4j_async(query),
+        )
+
+        self._result_cache[cache_key] = (pinecone_results, neo4j_results)
+        if len(self._result_cache) > RESULT_CACHE_MAX:
+            self._result_cache.popitem(last=False)
+
         return pinecone_results, neo4j_results
 
-    async def hybrid_search_with_metrics(self, query: str) -> Tuple[List[Dict], List[Dict], float]:
+    async def _timed(self, coro) -> Tuple[Any, float]:
+        """Await a coroutine and return (result, elapsed seconds)"""
+        start_time = time.time()
+        result = await coro
+        return result, time.time() - start_time
+
+    async def hybrid_search_with_leg_metrics(self, query: str, precomputed_embedding: List[float] = None) -> Tuple[List[Dict], List[Dict], float, float]:
+        """Run the Pinecone and Neo4j legs concurrently and time each one separately"""
+        (pinecone_results, pinecone_time), (neo4j_results, neo4j_time) = await asyncio.gather(
+            self._timed(self.query_pinecone_async(query, precomputed_embedding=precomputed_embedding)),
+            self._timed(self.query_neo4j_async(query)),
+        )
+        return pinecone_results, neo4j_results, pinecone_time, neo4j_time
+
+    async def hybrid_search_with_metrics(self, query: str, precomputed_embedding: List[float] = None) -> Tuple[List[Dict], List[Dict], float]:
         """Perform hybrid search and return results with timing"""
         start_time = time.time()
-        pinecone_results, neo4j_results = await self.hybrid_search(query)
+        pinecone_results, neo4j_results = await self.hybrid_search(query, precomputed_embedding=precomputed_embedding)
         search_time = time.time() - start_time
         
         return pinecone_results, neo4j_results, search_time
@@ -205,58 +337,66 @@ Always base recommendations on the provided context data from the travel databas
     def build_prompt(self, user_query: str, pinecone_matches: List[Dict], graph_facts: List[Dict]) -> List[Dict]:
         """Build chat prompt combining vector DB matches and graph facts"""
         
-        # Build vector context from Pinecone results
-        vec_context = []
-        for i, match in enumerate(pinecone_matches[:5], 1):
-            metadata = match.get('metadata', {})
-            score = match.get('score', 0)
-            
-            snippet = f"{i}. {metadata.get('name', 'Unknown')} "
-            snippet += f"(Type: {metadata.get('type', 'Unknown')}, "
-            snippet += f"Region: {metadata.get('region', 'Unknown')}) - "
-            snippet += f"{metadata.get('description', metadata.get('semantic_text', ''))} "
-            
-            tags = metadata.get('tags', [])
-            if tags:
-                snippet += f"Tags: {', '.join(tags)}. "
-                
-            best_time = metadata.get('best_time_to_visit', 'Not specified')
-            snippet += f"Best time: {best_time}. "
-            snippet += f"Relevance score: {score:.3f}"
-            
-            vec_context.append(snippet)
+        # Scores vary per query even for the same ids, so they are part of
+        # the vector block's cache key
+        vec_key = tuple((m.get('id', ''), m.get('score', 0)) for m in pinecone_matches[:5])
+        vec_block = self._vec_block_cache.get(vec_key)
+        if vec_block is None:
+            # Build vector context from Pinecone results - one f-string per
+            # match instead of incremental += reallocations
+            vec_context = []
+            for i, match in enumerate(pinecone_matches[:5], 1):
+                metadata = match.get('metadata', {})
+                tags = metadata.get('tags', [])
+                vec_context.append(
+                    f"{i}. {metadata.get('name', 'Unknown')} "
+                    f"(Type: {metadata.get('type', 'Unknown')}, "
+                    f"Region: {metadata.get('region', 'Unknown')}) - "
+                    f"{metadata.get('description', metadata.get('semantic_text', ''))} "
+                    + (f"Tags: {', '.join(tags)}. " if tags else "")
+                    + f"Best time: {metadata.get('best_time_to_visit', 'Not specified')}. "
+                    f"Relevance score: {match.get('score', 0):.3f}"
+                )
+            vec_block = "\n".join(vec_context)
+            self._vec_block_cache[vec_key] = vec_block
+            if len(self._vec_block_cache) > RESULT_CACHE_MAX:
+                self._vec_block_cache.popitem(last=False)
+        else:
+            self._vec_block_cache.move_to_end(vec_key)
 
-        # Build graph context from Neo4j results - IMPROVED
-        graph_context = []
-        
-        for fact in graph_facts[:8]:
-            snippet = f"• {fact.get('name', 'Unknown')} "
-            snippet += f"({fact.get('type', 'Unknown')}) "
-            snippet += f"in {fact.get('region', 'Unknown')}: "
-            snippet += f"{fact.get('description', '')} "
-            
-            # Add tags if available
-            tags = fact.get('tags', [])
-            if tags:
-                snippet += f"Features: {', '.join(tags[:3])}. "
-                
-            # Add nearby locations if available
-            nearby = fact.get('nearby_locations', [])
-            if nearby:
-                snippet += f"Nearby destinations: {', '.join(nearby[:2])}. "
-                
-            graph_context.append(snippet)
+        graph_key = tuple(f.get('node_id', '') for f in graph_facts[:8])
+        graph_block = self._graph_block_cache.get(graph_key)
+        if graph_block is None:
+            # Build graph context from Neo4j results - IMPROVED
+            graph_context = []
+            for fact in graph_facts[:8]:
+                tags = fact.get('tags', [])
+                nearby = fact.get('nearby_locations', [])
+                graph_context.append(
+                    f"• {fact.get('name', 'Unknown')} "
+                    f"({fact.get('type', 'Unknown')}) "
+                    f"in {fact.get('region', 'Unknown')}: "
+                    f"{fact.get('description', '')} "
+                    + (f"Features: {', '.join(tags[:3])}. " if tags else "")
+                    + (f"Nearby destinations: {', '.join(nearby[:2])}. " if nearby else "")
+                )
+            graph_block = "\n".join(graph_context)
+            self._graph_block_cache[graph_key] = graph_block
+            if len(self._graph_block_cache) > RESULT_CACHE_MAX:
+                self._graph_block_cache.popitem(last=False)
+        else:
+            self._graph_block_cache.move_to_end(graph_key)
 
         # Build final prompt
         prompt = [
             {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": 
+            {"role": "user", "content":
              f"User query: {user_query}\n\n"
-             "Top travel destinations from database:\n" + "\n".join(vec_context) + "\n\n"
-             "Location connections and context:\n" + "\n".join(graph_context) + "\n\n"
+             "Top travel destinations from database:\n" + vec_block + "\n\n"
+             "Location connections and context:\n" + graph_block + "\n\n"
              "Based on the above Vietnam travel data, provide a helpful response. Include specific cities, attractions, and practical travel advice."}
         ]
-        
+
         return prompt
 
     def generate_response(self, query: str, pinecone_results: List[Dict], neo4j_results: List[Dict]) -> str:
@@ -269,6 +409,25 @@ Always base recommendations on the provided context data from the travel databas
         except Exception as e:
             return f"I apologize, but I encountered an error while generating the response: {str(e)}"
 
+    async def generate_response_async(self, query: str, pinecone_results: List[Dict], neo4j_results: List[Dict]) -> str:
+        """Generate response with the async Groq client without blocking the loop"""
+        prompt = self.build_prompt(query, pinecone_results, neo4j_results)
+
+        try:
+            return await get_chat_completion_async(prompt, GROQ_MODEL)
+        except Exception as e:
+            return f"I apologize, but I encountered an error while generating the response: {str(e)}"
+
+    async def stream_response(self, query: str, pinecone_results: List[Dict], neo4j_results: List[Dict]):
+        """Stream the Groq answer token by token instead of waiting for the full text"""
+        prompt = self.build_prompt(query, pinecone_results, neo4j_results)
+
+        try:
+            async for delta in get_chat_completion_stream_async(prompt, GROQ_MODEL):
+                yield delta
+        except Exception as e:
+            yield f"I apologize, but I encountered an error while generating the response: {str(e)}"
+
     async def process_query_with_metrics(self, query: str) -> Tuple[List[Dict], List[Dict], str, float]:
         """Process query and return results with full metrics"""
         search_start = time.time()
@@ -276,38 +435,46 @@ Always base recommendations on the provided context data from the travel databas
         
         # Generate response
         response_start = time.time()
-        response = self.generate_response(query, pinecone_results, neo4j_results)
+        response = await self.generate_response_async(query, pinecone_results, neo4j_results)
         response_time = time.time() - response_start
         
         total_time = time.time() - search_start
         
-        print(f"✅ Search: {search_time:.2f}s, Response: {response_time:.2f}s, Total: {total_time:.2f}s")
+        logger.debug("Search: %.2fs, Response: %.2fs, Total: %.2fs",
+                     search_time, response_time, total_time)
         
         return pinecone_results, neo4j_results, response, total_time
 
     def get_system_status(self) -> Dict[str, Any]:
         """Get current system status for monitoring"""
-        status = {
+        # Re-verify Neo4j at most once per interval - each check is a network
+        # round trip, and status gets polled far more often than that
+        if self.neo4j_driver:
+            now = time.monotonic()
+            if now - self._last_verified > self._verify_interval:
+                try:
+                    self.neo4j_driver.verify_connectivity()
+                    self._neo4j_alive = True
+                except:
+                    self._neo4j_alive = False
+                self._last_verified = now
+
+        return {
             "pinecone_connected": True,
-            "neo4j_connected": self.neo4j_driver is not None,
+            "neo4j_connected": self._neo4j_alive,
             "groq_configured": bool(GROQ_API_KEY),
             "embedding_model_loaded": True
         }
-        
-        # Test Neo4j connection if available
-        if self.neo4j_driver:
-            try:
-                self.neo4j_driver.verify_connectivity()
-                status["neo4j_connected"] = True
-            except:
-                status["neo4j_connected"] = False
-        
-        return status
 
     def close(self):
         """Close connections"""
         if self.neo4j_driver:
             self.neo4j_driver.close()
+        if self.neo4j_async_driver:
+            try:
+                asyncio.run(self.neo4j_async_driver.close())
+            except Exception:
+                pass
 
 # Interactive chat interface
 def interactive_chat():
@@ -317,7 +484,12 @@ def interactive_chat():
     print("Type 'exit' to quit.\n")
     
     chat_system = HybridChatSystem()
-    
+
+    # One loop for the whole session - asyncio.run per query would tear down
+    # connections and redo TLS handshakes between questions
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
     try:
         while True:
             query = input("\nEnter your travel question: ").strip()
@@ -326,18 +498,29 @@ def interactive_chat():
 
             print("Processing your query...")
             start_time = time.time()
-            
+
             try:
-                pinecone_results, neo4j_results, response, total_time = asyncio.run(
-                    chat_system.process_query_with_metrics(query)
-                )
-                
-                print(f"\n=== Assistant Answer ===\n")
-                print(response)
-                print(f"\nSearch completed in {total_time:.2f}s")
+                async def _run_streamed():
+                    # Stream tokens as soon as search finishes instead of
+                    # waiting for the full Groq completion
+                    pinecone_results, neo4j_results, search_time = (
+                        await chat_system.hybrid_search_with_metrics(query)
+                    )
+
+                    print(f"\n=== Assistant Answer ===\n")
+                    async for delta in chat_system.stream_response(query, pinecone_results, neo4j_results):
+                        print(delta, end="", flush=True)
+                    print()
+
+                    return pinecone_results, neo4j_results, search_time
+
+                pinecone_results, neo4j_results, search_time = loop.run_until_complete(_run_streamed())
+                total_time = time.time() - start_time
+
+                print(f"\nSearch completed in {search_time:.2f}s, total {total_time:.2f}s")
                 print(f"Found {len(pinecone_results)} vector results and {len(neo4j_results)} graph results")
                 print("\n=== End ===\n")
-                
+
             except Exception as e:
                 print(f"❌ Error: {e}")
             
@@ -345,6 +528,7 @@ def interactive_chat():
         print("\n\nGoodbye!")
     finally:
         chat_system.close()
+        loop.close()
 
 if __name__ == "__main__":
     interactive_chat()
\ No newline at end of file
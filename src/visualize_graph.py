@@ -10,6 +10,16 @@ from pyvis.network import Network
 
 from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
 
+# All five stats counts in one round trip instead of a query each
+STATS_CYPHER = """
+CALL { MATCH (n) RETURN count(n) AS total_nodes }
+CALL { MATCH ()-[r]->() RETURN count(r) AS total_relationships }
+CALL { MATCH (l:Location) RETURN count(l) AS locations }
+CALL { MATCH (a:Activity) RETURN count(a) AS activities }
+CALL { MATCH (p:Place) RETURN count(p) AS places }
+RETURN total_nodes, total_relationships, locations, activities, places
+"""
+
 class GraphVisualizer:
     def __init__(self):
         self.driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
@@ -18,10 +28,10 @@ class GraphVisualizer:
         self.driver.close()
     
     def get_graph_data(self):
-        """Extract graph data from Neo4j"""
+        """Stream graph edges from Neo4j as tuples"""
         query = """
         MATCH (n)-[r]->(m)
-        RETURN 
+        RETURN
             labels(n)[0] as source_label,
             n.name as source_name,
             type(r) as relationship,
@@ -29,55 +39,59 @@ class GraphVisualizer:
             m.name as target_name
         LIMIT 200
         """
-        
+
+        # Generator: the bolt driver already streams, so records flow into
+        # graph construction without materializing an intermediate list
         with self.driver.session() as session:
-            result = session.run(query)
-            return [dict(record) for record in result]
-    
+            for record in session.run(query):
+                yield (record['source_label'], record['source_name'],
+                       record['relationship'],
+                       record['target_label'], record['target_name'])
+
     def create_network_graph(self):
         """Create an interactive network graph using PyVis"""
-        data = self.get_graph_data()
-        
-        # Create network
+        # Nodes get compact integer ids keyed by (label, name) tuples - no
+        # composed strings to hash per lookup, and smaller ids in the
+        # generated HTML. PyVis itself only accepts str/int ids
+        node_ids = {}
+        node_attrs = {}
+        edges = []
+
+        def _node_id(label, name):
+            key = (label, name)
+            node_id = node_ids.get(key)
+            if node_id is None:
+                node_id = node_ids[key] = len(node_ids)
+                node_attrs[node_id] = {'label': name, 'title': label, 'group': label}
+            return node_id
+
+        for source_label, source_name, relationship, target_label, target_name in self.get_graph_data():
+            edges.append((_node_id(source_label, source_name),
+                          _node_id(target_label, target_name),
+                          {'title': relationship}))
+
+        # Bulk-build the graph, then hand it to PyVis in one call instead of
+        # per-node/per-edge appends
+        graph = nx.MultiDiGraph()
+        graph.add_edges_from(edges)
+        nx.set_node_attributes(graph, node_attrs)
+
         net = Network(height="750px", width="100%", bgcolor="#222222", font_color="white")
-        
-        # Add nodes and edges
-        nodes = set()
-        for record in data:
-            source = f"{record['source_label']}: {record['source_name']}"
-            target = f"{record['target_label']}: {record['target_name']}"
-            
-            if source not in nodes:
-                net.add_node(source, label=record['source_name'], 
-                           title=record['source_label'], group=record['source_label'])
-                nodes.add(source)
-            
-            if target not in nodes:
-                net.add_node(target, label=record['target_name'], 
-                           title=record['target_label'], group=record['target_label'])
-                nodes.add(target)
-            
-            net.add_edge(source, target, title=record['relationship'])
-        
+        net.from_nx(graph)
         return net
     
     def show_basic_stats(self):
         """Display basic graph statistics"""
-        queries = {
-            "Total Nodes": "MATCH (n) RETURN count(n) as count",
-            "Total Relationships": "MATCH ()-[r]->() RETURN count(r) as count",
-            "Locations": "MATCH (l:Location) RETURN count(l) as count",
-            "Activities": "MATCH (a:Activity) RETURN count(a) as count",
-            "Places": "MATCH (p:Place) RETURN count(p) as count"
-        }
-        
-        stats = {}
         with self.driver.session() as session:
-            for name, query in queries.items():
-                result = session.run(query)
-                stats[name] = result.single()["count"]
-        
-        return stats
+            record = session.run(STATS_CYPHER).single()
+
+        return {
+            "Total Nodes": record["total_nodes"],
+            "Total Relationships": record["total_relationships"],
+            "Locations": record["locations"],
+            "Activities": record["activities"],
+            "Places": record["places"]
+        }
 
 def main():
     """Main function to visualize the graph"""
@@ -4,21 +4,76 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 import groq
+from concurrent.futures import ThreadPoolExecutor
 from sentence_transformers import SentenceTransformer
 import numpy as np
 from typing import List
 import asyncio
-from config import GROQ_API_KEY, EMBEDDING_MODEL, EMBEDDING_DIM
+from config import GROQ_API_KEY, EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_DIM, PINECONE_TARGET_DIM
+from utils.embeddings_numba import normalize_pad
+
+def _normalize_pad_matrix(embeddings: np.ndarray) -> np.ndarray:
+    """Normalize rows and zero-pad a (N, d) matrix to PINECONE_TARGET_DIM.
+
+    Single rows go through the JIT kernel; batches use one vectorized
+    normalize plus a single np.pad memset instead of a Python loop per row.
+    """
+    if embeddings.shape[0] == 1:
+        padded = np.empty((1, PINECONE_TARGET_DIM), dtype=np.float32)
+        normalize_pad(embeddings[0], padded[0])
+        return padded
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+    return np.pad(embeddings, ((0, 0), (0, PINECONE_TARGET_DIM - embeddings.shape[1])))
 
 class EmbeddingManager:
     def __init__(self):
-        # Initialize Groq client for chat
+        # Initialize Groq clients for chat (sync for the CLI, async for the app loop)
         self.groq_client = groq.Groq(api_key=GROQ_API_KEY)
+        self.groq_async_client = groq.AsyncGroq(api_key=GROQ_API_KEY)
         
+        # Cap intra-op parallelism before the model loads - concurrent encode
+        # calls at the default thread count (= all cores each) just fight
+        # over the same cores and thrash
+        gpu_available = False
+        try:
+            import torch
+            torch.set_num_threads(int(os.environ.get('EMBED_THREADS', '4')))
+            torch.set_num_interop_threads(1)
+            gpu_available = torch.cuda.is_available()
+        except Exception:
+            pass
+
+        # One dedicated worker thread (not the shared default pool) and a
+        # semaphore so async callers queue instead of overlapping on CPU
+        self._encode_executor = ThreadPoolExecutor(max_workers=1)
+        self._encode_sem = asyncio.Semaphore(4 if gpu_available else 1)
+
+        # Micro-batching coalescer state, started lazily on first async call
+        self._batch_queue = None
+        self._batcher_task = None
+
         # Initialize local embedding model
         print(f"🔄 Loading local embedding model: {EMBEDDING_MODEL}")
-        self.embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+        try:
+            if EMBEDDING_BACKEND != "torch":
+                # The backend kwarg only exists in sentence-transformers >= 3.2
+                self.embedding_model = SentenceTransformer(EMBEDDING_MODEL, backend=EMBEDDING_BACKEND)
+            else:
+                self.embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+        except Exception as e:
+            if EMBEDDING_BACKEND == "torch":
+                raise
+            # ONNX backend needs optimum/onnxruntime - fall back if missing
+            print(f"⚠️  {EMBEDDING_BACKEND} backend unavailable ({e}), falling back to torch")
+            self.embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+        self.native_dim = self.embedding_model.get_sentence_embedding_dimension()
         print("✅ Local embedding model loaded successfully!")
+        if self.native_dim != PINECONE_TARGET_DIM:
+            print(f"ℹ️  Padding {self.native_dim}-dim embeddings to {PINECONE_TARGET_DIM} "
+                  f"for the index - rebuild it at {self.native_dim} and set "
+                  f"PINECONE_TARGET_DIM to skip this")
     
     def get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Get embeddings using local SentenceTransformer model"""
@@ -27,30 +82,51 @@ class EmbeddingManager:
                 return []
             
             # Generate embeddings locally
-            embeddings = self.embedding_model.encode(texts, convert_to_tensor=False)
-            
-            # Convert to list of lists
-            if isinstance(embeddings, np.ndarray):
-                embeddings = embeddings.tolist()
-            
-            # Your Pinecone expects 1024 dimensions, but our model gives 384
-            # We'll pad the embeddings to match requirements
-            padded_embeddings = []
-            for embedding in embeddings:
-                if len(embedding) < 1024:
-                    # Pad with zeros to reach 1024 dimensions
-                    padded = embedding + [0.0] * (1024 - len(embedding))
-                    padded_embeddings.append(padded)
-                else:
-                    # Truncate if longer (unlikely)
-                    padded_embeddings.append(embedding[:1024])
-            
-            return padded_embeddings
+            embeddings = np.asarray(
+                self.embedding_model.encode(texts, convert_to_tensor=False),
+                dtype=np.float32
+            )
+
+            # Your Pinecone index expects 1024 dimensions, but the model gives fewer.
+            if embeddings.shape[1] >= PINECONE_TARGET_DIM:
+                # Truncate if longer (unlikely)
+                return embeddings[:, :PINECONE_TARGET_DIM].tolist()
+
+            return _normalize_pad_matrix(embeddings).tolist()
         except Exception as e:
             print(f"❌ Error generating local embeddings: {e}")
-            # Return zero vectors as fallback (1024 dimensions)
-            return [[0.0] * 1024 for _ in texts]
+            # Return zero vectors as fallback at the index dimension
+            return [[0.0] * PINECONE_TARGET_DIM for _ in texts]
     
+    def get_embeddings_batched(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Encode a whole corpus in one batched pass.
+
+        Returns the padded float32 matrix directly so callers can keep
+        slicing rows without paying for .tolist() until they actually
+        hand data to an SDK.
+        """
+        try:
+            if not texts:
+                return np.empty((0, PINECONE_TARGET_DIM), dtype=np.float32)
+
+            embeddings = np.asarray(
+                self.embedding_model.encode(
+                    texts,
+                    batch_size=batch_size,
+                    show_progress_bar=True,
+                    convert_to_numpy=True
+                ),
+                dtype=np.float32
+            )
+
+            if embeddings.shape[1] >= PINECONE_TARGET_DIM:
+                return embeddings[:, :PINECONE_TARGET_DIM]
+
+            return _normalize_pad_matrix(embeddings)
+        except Exception as e:
+            print(f"❌ Error generating batched embeddings: {e}")
+            return np.zeros((len(texts), PINECONE_TARGET_DIM), dtype=np.float32)
+
     def get_chat_completion(self, messages: List[dict], model: str = "llama-3.1-8b-instant") -> str:
         """Get chat completion using Groq with your specific parameters"""
         try:
@@ -68,11 +144,104 @@ class EmbeddingManager:
             print(f"❌ Error getting Groq completion: {e}")
             return f"I apologize, but I encountered an error with the AI service: {str(e)}"
 
+    async def get_chat_completion_async(self, messages: List[dict], model: str = "llama-3.1-8b-instant") -> str:
+        """Get chat completion with the async Groq client so the event loop stays free"""
+        try:
+            response = await self.groq_async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1024,
+                top_p=1,
+                stream=False,
+                stop=None
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"❌ Error getting Groq completion: {e}")
+            return f"I apologize, but I encountered an error with the AI service: {str(e)}"
+
+    # Coalesce concurrent async requests for up to this long / this many texts
+    # before dispatching one batched forward pass
+    COALESCE_WINDOW = 0.015
+    COALESCE_MAX_TEXTS = 64
+
+    async def _coalesce_worker(self):
+        """Drain queued embedding requests into single batched encode calls"""
+        loop = asyncio.get_event_loop()
+        while True:
+            pending = [await self._batch_queue.get()]
+            total = len(pending[0][0])
+            deadline = loop.time() + self.COALESCE_WINDOW
+
+            # Gather whatever else arrives inside the window
+            while total < self.COALESCE_MAX_TEXTS:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._batch_queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                total += len(item[0])
+
+            all_texts = [text for texts, _ in pending for text in texts]
+            try:
+                async with self._encode_sem:
+                    embeddings = await loop.run_in_executor(
+                        self._encode_executor, self.get_embeddings, all_texts
+                    )
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            # Hand each caller back its slice of the batch
+            offset = 0
+            for texts, future in pending:
+                if not future.done():
+                    future.set_result(embeddings[offset:offset + len(texts)])
+                offset += len(texts)
+
+    async def get_chat_completion_stream_async(self, messages: List[dict], model: str = "llama-3.1-8b-instant"):
+        """Stream chat completion deltas from the async Groq client.
+
+        Keeps the shared event loop free between tokens, unlike iterating
+        the sync stream from a coroutine.
+        """
+        try:
+            stream = await self.groq_async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1024,
+                top_p=1,
+                stream=True,
+                stop=None
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            print(f"❌ Error streaming Groq completion: {e}")
+            yield f"I apologize, but I encountered an error with the AI service: {str(e)}"
+
     async def get_embeddings_async(self, texts: List[str]) -> List[List[float]]:
-        """Get embeddings asynchronously"""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.get_embeddings, texts
-        )
+        """Get embeddings asynchronously, coalescing concurrent callers into one batch"""
+        if not texts:
+            return []
+
+        loop = asyncio.get_event_loop()
+        if self._batch_queue is None:
+            self._batch_queue = asyncio.Queue()
+            self._batcher_task = loop.create_task(self._coalesce_worker())
+
+        future = loop.create_future()
+        await self._batch_queue.put((list(texts), future))
+        return await future
 
 # Global instance
 embedding_manager = EmbeddingManager()
@@ -80,8 +249,17 @@ embedding_manager = EmbeddingManager()
 def get_embeddings(texts: List[str]) -> List[List[float]]:
     return embedding_manager.get_embeddings(texts)
 
+def get_embeddings_batched(texts: List[str], batch_size: int = 64) -> np.ndarray:
+    return embedding_manager.get_embeddings_batched(texts, batch_size)
+
 def get_chat_completion(messages: List[dict], model: str = "llama-3.1-8b-instant") -> str:
     return embedding_manager.get_chat_completion(messages, model)
 
+def get_chat_completion_stream_async(messages: List[dict], model: str = "llama-3.1-8b-instant"):
+    return embedding_manager.get_chat_completion_stream_async(messages, model)
+
+async def get_chat_completion_async(messages: List[dict], model: str = "llama-3.1-8b-instant") -> str:
+    return await embedding_manager.get_chat_completion_async(messages, model)
+
 async def get_embeddings_async(texts: List[str]) -> List[List[float]]:
     return await embedding_manager.get_embeddings_async(texts)
\ No newline at end of file
@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+
+# Numba is optional - the NumPy fallback keeps behaviour identical without it
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _normalize_pad_1d(src, out):
+        # Single pass for the squared norm, second pass scales, tail zero-fills.
+        # Kept strictly 1D so Numba's typing stays happy; callers loop rows.
+        s = 0.0
+        for i in range(src.shape[0]):
+            s += src[i] * src[i]
+
+        if s == 0.0:
+            for i in range(out.shape[0]):
+                out[i] = 0.0
+            return
+
+        inv = 1.0 / math.sqrt(s)
+        for i in range(src.shape[0]):
+            out[i] = src[i] * inv
+        for i in range(src.shape[0], out.shape[0]):
+            out[i] = 0.0
+
+def normalize_pad(src: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """L2-normalize a 1D embedding into the preallocated out buffer, zero-padding the tail"""
+    if NUMBA_AVAILABLE:
+        _normalize_pad_1d(src, out)
+        return out
+
+    norm = np.linalg.norm(src)
+    if norm == 0.0:
+        out[:] = 0.0
+        return out
+
+    out[:src.shape[0]] = src / norm
+    out[src.shape[0]:] = 0.0
+    return out
@@ -0,0 +1,54 @@
+import os
+import pickle
+import time
+
+# Small on-disk cache so a browser refresh can resume the last response
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+MAX_CACHE_BYTES = 5 * 1024 * 1024  # skip payloads that pickle larger than 5 MB
+MAX_AGE_SECONDS = 7 * 24 * 3600  # session payloads expire after a week
+
+def _prune_expired() -> None:
+    """Best-effort removal of session files past their expiry"""
+    try:
+        cutoff = time.time() - MAX_AGE_SECONDS
+        for name in os.listdir(CACHE_DIR):
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(CACHE_DIR, name)
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+    except Exception:
+        pass
+
+def _cache_path(session_id: str) -> str:
+    return os.path.join(CACHE_DIR, f"{session_id}.pkl")
+
+def save(session_id: str, obj) -> bool:
+    """Pickle a session payload to disk, skipping oversized objects"""
+    try:
+        payload = pickle.dumps(obj)
+        if len(payload) > MAX_CACHE_BYTES:
+            print(f"⚠️  Session payload too large to cache ({len(payload)} bytes)")
+            return False
+
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(session_id), 'wb') as f:
+            f.write(payload)
+        _prune_expired()
+        return True
+    except Exception as e:
+        print(f"⚠️  Could not save session cache: {e}")
+        return False
+
+def load(session_id: str):
+    """Load a previously saved session payload, or None if absent or corrupt"""
+    try:
+        path = _cache_path(session_id)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"⚠️  Could not load session cache: {e}")
+        return None